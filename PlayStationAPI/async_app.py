@@ -0,0 +1,88 @@
+"""
+Yüksek eşzamanlılık için app.py'nin asenkron (ASGI) karşılığı.
+PyMongo'nun AsyncMongoClient'ını kullanır; endpoint'ler app.py ile aynıdır.
+
+Çalıştırma: hypercorn async_app:app --bind 0.0.0.0:5002 --workers 4
+"""
+from quart import Quart, jsonify
+from quart_cors import cors
+from pymongo import AsyncMongoClient
+from dotenv import load_dotenv
+from bson import json_util
+
+from db import client_options, get_mongo_uri, get_db_name
+
+
+def create_app() -> Quart:
+    # .env dosyasındaki ortam değişkenlerini yükle
+    load_dotenv()
+
+    app = cors(Quart(__name__))
+
+    # İstemci her işçinin kendi olay döngüsünde, ilk istekte oluşturulur. Böylece
+    # fork öncesinde bağlantı açılmaz ve MONGO_URI eksikse sunucu yine de başlar;
+    # /healthz 200, /readyz 503 döner (app.py ile aynı davranış).
+    app.mongo_client = None
+
+    def get_db():
+        if app.mongo_client is None:
+            app.mongo_client = AsyncMongoClient(get_mongo_uri(), **client_options())
+        return app.mongo_client[get_db_name()]
+
+    @app.after_serving
+    async def close_client():
+        if app.mongo_client is not None:
+            await app.mongo_client.close()
+            app.mongo_client = None
+
+    # --- SAĞLIK KONTROLLERİ ---
+
+    @app.route("/healthz", methods=["GET"])
+    async def health():
+        """Süreç ayakta mı? Veritabanına erişmez."""
+        return jsonify({"status": "ok"}), 200
+
+    @app.route("/readyz", methods=["GET"])
+    async def readiness():
+        """Uygulama istek almaya hazır mı? MongoDB'ye ping atar."""
+        try:
+            await get_db().command('ping')
+            return jsonify({"status": "ready"}), 200
+        except Exception as e:
+            return jsonify({"status": "unavailable", "error": str(e)}), 503
+
+    # --- API ENDPOINT'LERİ ---
+
+    @app.route("/api/games", methods=["GET"])
+    async def get_all_games():
+        """Tüm oyunları veritabanından çeker ve JSON olarak döndürür."""
+        try:
+            games = await get_db()['games'].find().sort("name", 1).to_list(None)
+            return json_util.dumps(games), 200, {'Content-Type': 'application/json'}
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    @app.route("/api/games/<string:game_id>/price", methods=["GET"])
+    async def get_latest_price(game_id):
+        """Belirli bir oyunun en son fiyat kaydını döndürür."""
+        try:
+            latest_price_doc = await get_db()['price_history'].find_one(
+                {"gameId": game_id},
+                sort=[("snapshotDate", -1)]
+            )
+
+            if not latest_price_doc:
+                return jsonify({"error": "Bu oyun için fiyat bilgisi bulunamadı."}), 404
+
+            return json_util.dumps(latest_price_doc), 200, {'Content-Type': 'application/json'}
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    app.run(port=5002)
@@ -0,0 +1,79 @@
+import os
+import threading
+from pymongo import MongoClient
+from pymongo.database import Database
+
+# --- MONGODB AYARLARI ---
+# Tüm değerler ortam değişkenleriyle değiştirilebilir. Değerler import anında değil,
+# kullanıldıkları anda okunur; böylece create_app() içindeki load_dotenv() etkili olur.
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+
+def client_options() -> dict:
+    """MongoClient ve AsyncMongoClient için ortak bağlantı havuzu ve zaman aşımı ayarları."""
+    return {
+        # Her işçi sürecinin açabileceği en fazla bağlantı sayısı
+        'maxPoolSize': int(os.getenv('MONGO_MAX_POOL_SIZE', '50')),
+        # İlk isteklerde bağlantı kurma gecikmesini azaltmak için açık tutulan bağlantılar
+        'minPoolSize': int(os.getenv('MONGO_MIN_POOL_SIZE', '5')),
+        'maxIdleTimeMS': int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '60000')),
+        # Havuz doluysa bir isteğin boş bağlantı için en fazla bekleme süresi
+        'waitQueueTimeoutMS': int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000')),
+        'serverSelectionTimeoutMS': int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+        'connectTimeoutMS': int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+        'socketTimeoutMS': int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '10000')),
+    }
+
+
+def get_db_name() -> str:
+    return os.getenv('MONGO_DB_NAME', 'GamesDB')
+
+
+def get_mongo_uri() -> str:
+    mongo_uri = os.getenv('MONGO_URI')
+    if not mongo_uri:
+        raise Exception("HATA: MONGO_URI ortam değişkeni bulunamadı!")
+    return mongo_uri
+
+
+def _reset_client():
+    """Fork sonrası çocuk süreçte çağrılır; ebeveynin bağlantıları kullanılmaz."""
+    global _client, _client_pid, _lock
+    _client = None
+    _client_pid = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client)
+
+
+def get_client() -> MongoClient:
+    """
+    MongoClient'ı ilk kullanımda oluşturur ve süreç boyunca paylaşır.
+    Ön-fork'lu sunucularda (gunicorn) her işçi kendi istemcisini oluşturur.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client = MongoClient(get_mongo_uri(), connect=False, **client_options())
+                _client_pid = pid
+    return _client
+
+
+def get_db() -> Database:
+    return get_client()[get_db_name()]
+
+
+def close_client():
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
@@ -0,0 +1,22 @@
+# Üretim sunucusu ayarları: gunicorn -c gunicorn.conf.py app:app
+import os
+import multiprocessing
+
+bind = os.getenv('BIND', '0.0.0.0:5001')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Her işçi, MongoDB'yi beklerken diğer istekleri bloke etmemek için thread'lerle çalışır.
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = 30
+keepalive = 5
+# Uygulama master süreçte bir kez yüklenir, işçiler fork ile hızlıca başlar.
+# MongoClient tembel oluşturulduğu için fork öncesinde bağlantı açılmaz (bkz. db.py).
+preload_app = True
+max_requests = 10000
+max_requests_jitter = 1000
+
+
+def worker_exit(server, worker):
+    """İşçi kapanırken kendi MongoClient'ının bağlantılarını kapatır."""
+    from db import close_client
+    close_client()
@@ -0,0 +1,137 @@
+"""
+API için basit yük testi. Yerel bir mongod'a örnek veri yükler ve çalışan
+sunucuya eşzamanlı istekler atarak gecikme yüzdeliklerini raporlar.
+
+Örnek veri, üretimdeki MONGO_URI / MONGO_DB_NAME yerine LOADTEST_MONGO_URI ve
+LOADTEST_DB_NAME ile belirtilen veritabanına yazılır. Yükleme sırasında koleksiyonlar
+silindiği için, yerel olmayan bir sunucuda --yes-drop verilmeden işlem yapılmaz.
+
+Örnek:
+    python load_test.py --seed
+    export MONGO_URI=mongodb://localhost:27017 MONGO_DB_NAME=GamesDB_loadtest
+    gunicorn -c gunicorn.conf.py app:app          # veya: hypercorn async_app:app --bind 0.0.0.0:5001
+    python load_test.py --url http://localhost:5001 --concurrency 64 --requests 5000
+"""
+import os
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.uri_parser import parse_uri
+
+LOADTEST_MONGO_URI = os.getenv('LOADTEST_MONGO_URI', 'mongodb://localhost:27017')
+LOADTEST_DB_NAME = os.getenv('LOADTEST_DB_NAME', 'GamesDB_loadtest')
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+
+SEED_GAME_COUNT = 3600
+SEED_DAYS = 30
+
+_local = threading.local()
+
+
+def is_local_uri(mongo_uri: str) -> bool:
+    """Bağlantı adresindeki tüm sunucular bu makinedeyse True döndürür."""
+    if mongo_uri.startswith('mongodb+srv://'):
+        return False
+    return all(host in LOCAL_HOSTS for host, _ in parse_uri(mongo_uri)['nodelist'])
+
+
+def seed_database(mongo_uri: str, db_name: str, allow_remote_drop: bool = False):
+    """Gerçek veriye benzer oyun ve fiyat geçmişi dokümanlarını test veritabanına yazar."""
+    if not allow_remote_drop and not is_local_uri(mongo_uri):
+        raise SystemExit("HATA: Örnek veri yüklemek koleksiyonları siler. Yerel olmayan bir sunucu "
+                         "için --yes-drop bayrağını açıkça vermelisiniz.")
+
+    client = MongoClient(mongo_uri)
+    db = client[db_name]
+    db['games'].drop()
+    db['price_history'].drop()
+
+    game_ids = [str(10000000 + i) for i in range(SEED_GAME_COUNT)]
+    db['games'].insert_many([{'_id': game_id, 'name': f"Oyun {game_id}"} for game_id in game_ids])
+
+    start = datetime.now() - timedelta(days=SEED_DAYS)
+    for day in range(SEED_DAYS):
+        snapshot = (start + timedelta(days=day)).isoformat() + "Z"
+        db['price_history'].insert_many([
+            {
+                'gameId': game_id,
+                'snapshotDate': snapshot,
+                'editions': [{'name': 'Standart Sürüm', 'price': f"{random.randint(100, 3000)},00"}],
+            }
+            for game_id in game_ids
+        ])
+    # En son fiyat sorgusunun dayandığı indeks
+    db['price_history'].create_index([('gameId', ASCENDING), ('snapshotDate', DESCENDING)])
+    db['games'].create_index([('name', ASCENDING)])
+    client.close()
+    print(f"{SEED_GAME_COUNT} oyun ve {SEED_GAME_COUNT * SEED_DAYS} fiyat kaydı '{db_name}' veritabanına yazıldı.")
+
+
+def _session() -> requests.Session:
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def timed_request(url: str) -> float:
+    """İsteği atar ve süresini milisaniye olarak döndürür; hata durumunda -1."""
+    started = time.perf_counter()
+    try:
+        response = _session().get(url, timeout=30)
+        if response.status_code >= 500:
+            return -1
+    except requests.exceptions.RequestException:
+        return -1
+    return (time.perf_counter() - started) * 1000
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load_test(base_url: str, concurrency: int, total_requests: int, list_ratio: float):
+    game_ids = [str(10000000 + i) for i in range(SEED_GAME_COUNT)]
+    urls = [
+        f"{base_url}/api/games" if random.random() < list_ratio
+        else f"{base_url}/api/games/{random.choice(game_ids)}/price"
+        for _ in range(total_requests)
+    ]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed_request, urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r for r in results if r >= 0)
+    errors = len(results) - len(latencies)
+    print(f"{total_requests} istek, {concurrency} eşzamanlı bağlantı, {elapsed:.1f} sn "
+          f"({total_requests / elapsed:.0f} istek/sn), {errors} hata")
+    if latencies:
+        print(f"p50: {percentile(latencies, 50):.1f} ms | p95: {percentile(latencies, 95):.1f} ms | "
+              f"p99: {percentile(latencies, 99):.1f} ms | max: {latencies[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PlayStation API yük testi")
+    parser.add_argument('--seed', action='store_true', help="Test veritabanına örnek veri yükle")
+    parser.add_argument('--yes-drop', action='store_true',
+                        help="Yerel olmayan bir sunucuda da koleksiyonların silinmesine izin ver")
+    parser.add_argument('--url', default='http://localhost:5001')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--list-ratio', type=float, default=0.05,
+                        help="Tüm oyun listesini isteyen isteklerin oranı")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_database(LOADTEST_MONGO_URI, LOADTEST_DB_NAME, allow_remote_drop=args.yes_drop)
+    else:
+        run_load_test(args.url.rstrip('/'), args.concurrency, args.requests, args.list_ratio)
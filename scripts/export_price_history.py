@@ -0,0 +1,309 @@
+# scripts/export_price_history.py
+"""
+'price_history' koleksiyonunun tamamını kompakt, sütunlu bir ikili dosyaya aktarır.
+
+Dosya biçimi (tüm sayılar little-endian):
+
+    Dosya başlığı : b'PSPH' + uint16 sürüm + uint16 ayrılmış
+    Blok (tekrar eder, her çalıştırma sonuna yeni bloklar ekler):
+        b'BLK1'                 blok işareti
+        uint32 yeni_string      bu blokta sözlüğe eklenen string sayısı
+        uint32 satir            bu bloktaki satır sayısı
+        int64  taban_zaman      bloktaki en eski kaydın Unix zamanı (saniye)
+        uint16 + bytes          bloktaki son dokümanın '_id' değeri (hex, UTF-8)
+        (uint16 + bytes) * yeni_string
+                                sözlüğe eklenen stringler (gameId ve sürüm adları)
+        0-3 bayt dolgu          sütunların 4 bayta hizalanması için
+        uint32[satir]           gameId sözlük indeksi
+        uint32[satir]           taban_zaman'a göre saniye farkı (delta)
+        uint32[satir]           sürüm adı sözlük indeksi
+        int32[satir]            fiyat (kuruş); ücretsiz/dahil ise 0, fiyat alınamadıysa -1
+
+Sözlük dosya boyunca ortaktır: her blok yalnızca daha önce görülmemiş stringleri
+ekler, indeksler dosyanın başından itibaren sayılır. Sütunlar hizalı olduğu için
+okuyucu dosyayı mmap ile açıp sütunları kopyalamadan okuyabilir.
+
+Artımlı aktarım 'snapshotDate' yerine '_id' (ObjectId) üzerinden ilerler:
+'snapshotDate' işçi thread'lerinde atanır ama dokümanlar ana thread'de
+görevlerin tamamlanma sırasıyla eklenir, yani eklenme sırası 'snapshotDate'
+sırasını izlemez. ObjectId ise ekleme anında, tek bir kazıyıcı süreci içinde artan
+sırayla üretilir. Bu yüzden aynı anda birden fazla kazıyıcı süreci
+'price_history'e yazmamalıdır.
+"""
+
+import os
+import math
+import mmap
+import struct
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Iterator, NamedTuple, Tuple
+from bson import ObjectId
+from pymongo.database import Database
+
+from generate_discount_report import setup_mongodb_connection
+
+# --- AYARLAR ---
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_EXPORT_FILE = os.path.join(PROJECT_ROOT, 'price_history.bin')
+# Bellekte tutulacak en fazla satır sayısı; her dolduğunda bir blok yazılır.
+ROWS_PER_BLOCK = 50_000
+# MongoDB imlecinin sunucudan tek seferde getireceği doküman sayısı
+CURSOR_BATCH_SIZE = 1_000
+
+FILE_MAGIC = b'PSPH'
+FILE_VERSION = 2
+BLOCK_MAGIC = b'BLK1'
+FILE_HEADER = struct.Struct('<4sHH')
+BLOCK_HEADER = struct.Struct('<4sIIq')
+STRING_LENGTH = struct.Struct('<H')
+MISSING_PRICE = -1
+# Gerçekten ücretsiz olan ya da bir aboneliğe dahil olan ürünleri belirten etiketler
+FREE_PRICE_TAGS = ['ücretsiz', 'dahil', 'oyna', 'indir']
+
+
+class ExportBlock(NamedTuple):
+    """Tek bir bloğun sütunları (mmap üzerinde, kopyalanmadan)."""
+    base_timestamp: int
+    last_id: str
+    game_index: memoryview
+    time_delta: memoryview
+    edition_index: memoryview
+    price: memoryview
+
+
+# --- YARDIMCI FONKSİYONLAR ---
+
+def snapshot_to_timestamp(snapshot_date: str) -> int:
+    """'snapshotDate' ISO metnini Unix zamanına (saniye) çevirir."""
+    dt = datetime.fromisoformat(snapshot_date.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def price_to_kurus(price_str: Optional[str]) -> int:
+    """
+    Fiyat metnini kuruş cinsinden tam sayıya çevirir. 'parse_price'tan farklı olarak
+    'N/A' gibi alınamamış fiyatları 0 değil MISSING_PRICE olarak döndürür.
+    """
+    if price_str is None:
+        return MISSING_PRICE
+    price_str = price_str.strip().lower()
+    if any(tag in price_str for tag in FREE_PRICE_TAGS):
+        return 0
+    try:
+        value = float(price_str.replace('.', '').replace(',', '.'))
+    except ValueError:
+        return MISSING_PRICE
+    if not math.isfinite(value) or value < 0:
+        return MISSING_PRICE
+    return int(round(value * 100))
+
+
+def _read_string(buf, offset: int) -> Tuple[str, int]:
+    (length,) = STRING_LENGTH.unpack_from(buf, offset)
+    offset += STRING_LENGTH.size
+    return bytes(buf[offset:offset + length]).decode('utf-8'), offset + length
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode('utf-8')
+    return STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def _padding(offset: int) -> int:
+    return -offset % 4
+
+
+# --- OKUYUCU ---
+
+class PriceHistoryReader:
+    """
+    Dışa aktarılan dosyayı mmap ile açar. Sütunlar dosyadan kopyalanmadan
+    memoryview olarak döndürülür; sözlük tüm bloklar boyunca biriktirilir.
+    """
+
+    def __init__(self, path: str = OUTPUT_EXPORT_FILE):
+        self.path = path
+        self.strings: List[str] = []
+        self.blocks: List[ExportBlock] = []
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._parse()
+
+    def _parse(self):
+        buf = memoryview(self._mmap)
+        magic, version, _ = FILE_HEADER.unpack_from(buf, 0)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"HATA: '{self.path}' geçerli bir fiyat geçmişi dosyası değil.")
+
+        offset = FILE_HEADER.size
+        while offset < len(buf):
+            magic, string_count, row_count, base_timestamp = BLOCK_HEADER.unpack_from(buf, offset)
+            if magic != BLOCK_MAGIC:
+                raise ValueError(f"HATA: {offset}. baytta bozuk blok bulundu.")
+            offset += BLOCK_HEADER.size
+            last_id, offset = _read_string(buf, offset)
+            for _ in range(string_count):
+                value, offset = _read_string(buf, offset)
+                self.strings.append(value)
+            offset += _padding(offset)
+
+            columns = []
+            for fmt in ('I', 'I', 'I', 'i'):
+                end = offset + 4 * row_count
+                columns.append(buf[offset:end].cast(fmt))
+                offset = end
+            self.blocks.append(ExportBlock(base_timestamp, last_id, *columns))
+
+    @property
+    def last_id(self) -> Optional[str]:
+        return self.blocks[-1].last_id if self.blocks else None
+
+    def iter_rows(self) -> Iterator[Tuple[str, int, str, Optional[float]]]:
+        """Satırları (gameId, unix_zaman, sürüm_adı, fiyat_TL) olarak tek tek döndürür."""
+        for block in self.blocks:
+            for i in range(len(block.game_index)):
+                price = block.price[i]
+                yield (
+                    self.strings[block.game_index[i]],
+                    block.base_timestamp + block.time_delta[i],
+                    self.strings[block.edition_index[i]],
+                    None if price == MISSING_PRICE else price / 100,
+                )
+
+    def close(self):
+        # mmap, üzerindeki memoryview'lar serbest bırakılmadan kapatılamaz.
+        for block in self.blocks:
+            for column in block[2:]:
+                column.release()
+        self.blocks = []
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- YAZICI ---
+
+class _BlockWriter:
+    """Satırları sütunlar halinde biriktirir ve dolan her bloğu dosyaya ekler."""
+
+    def __init__(self, f, strings: List[str]):
+        self.f = f
+        self.string_index: Dict[str, int] = {value: i for i, value in enumerate(strings)}
+        self.written_rows = 0
+        self._reset()
+
+    def _reset(self):
+        self.new_strings: List[str] = []
+        self.game_index = array('I')
+        self.timestamps: List[int] = []
+        self.edition_index = array('I')
+        self.price = array('i')
+        self.last_id = ''
+
+    def _lookup(self, value: str) -> int:
+        index = self.string_index.get(value)
+        if index is None:
+            index = len(self.string_index)
+            self.string_index[value] = index
+            self.new_strings.append(value)
+        return index
+
+    def add_document(self, doc: Dict[str, Any]):
+        game = self._lookup(doc['gameId'])
+        timestamp = snapshot_to_timestamp(doc['snapshotDate'])
+        for edition in doc.get('editions', []):
+            self.game_index.append(game)
+            self.timestamps.append(timestamp)
+            self.edition_index.append(self._lookup(edition['name']))
+            self.price.append(price_to_kurus(edition.get('price')))
+        self.last_id = str(doc['_id'])
+
+        if len(self.game_index) >= ROWS_PER_BLOCK:
+            self.flush()
+
+    def flush(self):
+        if not self.timestamps:
+            return
+        # İmleç '_id'ye göre sıralı; snapshotDate sırası garanti olmadığından en küçüğü taban alınır.
+        base_timestamp = min(self.timestamps)
+        time_delta = array('I', (ts - base_timestamp for ts in self.timestamps))
+
+        parts = [
+            BLOCK_HEADER.pack(BLOCK_MAGIC, len(self.new_strings), len(self.timestamps), base_timestamp),
+            _pack_string(self.last_id),
+        ]
+        parts.extend(_pack_string(value) for value in self.new_strings)
+        header = b''.join(parts)
+        # Blok başlangıcı her zaman 4 bayta hizalı olduğundan dolgu yalnızca başlığa bağlıdır.
+        header += b'\x00' * _padding(len(header))
+
+        self.f.write(header)
+        for column in (self.game_index, time_delta, self.edition_index, self.price):
+            self.f.write(column.tobytes())
+
+        self.written_rows += len(self.timestamps)
+        self._reset()
+
+
+def export_price_history(db: Database, path: str = OUTPUT_EXPORT_FILE) -> int:
+    """
+    Dosyadaki son dokümandan ('_id') sonra eklenen fiyat geçmişini dosyanın sonuna ekler.
+    Dokümanlar imleçle akış halinde okunur; bellekte en fazla bir blok tutulur.
+    Yazılan satır sayısını döndürür.
+    """
+    strings: List[str] = []
+    last_id = None
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with PriceHistoryReader(path) as reader:
+            strings = list(reader.strings)
+            last_id = reader.last_id
+    else:
+        with open(path, 'wb') as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, 0))
+
+    query = {"_id": {"$gt": ObjectId(last_id)}} if last_id else {}
+    cursor = (db['price_history']
+              .find(query, {'gameId': 1, 'snapshotDate': 1, 'editions': 1})
+              .sort("_id", 1)
+              .batch_size(CURSOR_BATCH_SIZE))
+
+    with open(path, 'ab') as f:
+        start_size = f.tell()
+        writer = _BlockWriter(f, strings)
+        try:
+            for doc in cursor:
+                writer.add_document(doc)
+            writer.flush()
+        except Exception:
+            # Yarım kalan bloklar dosyayı bozmasın diye çalıştırma öncesine geri dön.
+            f.truncate(start_size)
+            raise
+        finally:
+            cursor.close()
+
+    return writer.written_rows
+
+
+def run_export():
+    client, db = setup_mongodb_connection()
+    if client is None or db is None:
+        # İş akışındaki adımın başarısız görünmesi için sıfırdan farklı kodla çık
+        raise SystemExit(1)
+
+    try:
+        row_count = export_price_history(db)
+        print(f"{row_count} yeni fiyat satırı '{OUTPUT_EXPORT_FILE}' dosyasına eklendi.")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    run_export()
@@ -18,6 +18,8 @@ MONGO_URI = os.getenv('MONGO_URI')
 MONGO_DB_NAME = "GamesDB"
 # Kaç günlük geçmişe bakılacağını belirle
 LOOKBACK_DAYS = 7
+# Rapora uzun dönemli fiyat istatistikleri (en düşük fiyat, indirim sıklığı vb.) eklensin mi?
+INCLUDE_HISTORY_STATS = os.getenv('INCLUDE_HISTORY_STATS', '1') == '1'
 
 
 # --- VERİTABANI VE YARDIMCI FONKSİYONLAR ---
@@ -49,6 +51,11 @@ def parse_price(price_str: Optional[str]) -> Optional[float]:
         return None
 
 
+def format_price(value: float) -> str:
+    """Sayısal fiyatı mağazadaki '1.299,00' biçimine çevirir."""
+    return f"{value:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
 # --- ANA İŞLEM FONKSİYONLARI ---
 
 def get_latest_snapshot_date(db: Database) -> Optional[str]:
@@ -151,6 +158,7 @@ def generate_report():
                         # Aynı oyun/sürüm için birden fazla düşüş varsa en sonuncusunu tut
                         drop_key = f"{game_id}-{current_edition['name']}"
                         recent_price_drops[drop_key] = {
+                            'game_id': game_id,
                             'name': game_name,
                             'edition': current_edition['name'],
                             'old_price': prev_edition.get('price'),
@@ -158,20 +166,37 @@ def generate_report():
                             'drop_date': drop_date  # İndirimin olduğu günün tarihi
                         }
 
-    # 5. Rapor için son listeyi oluştur
+    # 5. Uzun dönemli istatistikleri yerel önbellekten oku.
+    # Önbellek ayrı bir adımda 'export_price_history.py' ile güncellenir; rapor yalnızca okur.
+    edition_stats = {}
+    if INCLUDE_HISTORY_STATS:
+        # numpy yalnızca bu özellik açıkken gerekli olduğu için burada içe aktarılır
+        from price_analytics import get_edition_stats, OUTPUT_EXPORT_FILE
+        if os.path.exists(OUTPUT_EXPORT_FILE):
+            edition_stats = get_edition_stats()
+        else:
+            print(f"UYARI: '{OUTPUT_EXPORT_FILE}' bulunamadı, rapora fiyat geçmişi istatistikleri eklenmedi.")
+
+    # 6. Rapor için son listeyi oluştur
     final_drops_list = []
     for drop in recent_price_drops.values():
         duration = (datetime.now(timezone.utc).date() - drop['drop_date'].date()).days
         drop['duration_days'] = duration
         del drop['drop_date']  # Raporda bu alana gerek yok
+        stats = edition_stats.get((drop.pop('game_id'), drop['edition']))
+        if stats:
+            drop['all_time_low'] = format_price(stats['all_time_low'])
+            drop['drop_count'] = stats['drop_count']
+            drop['avg_drop_pct'] = stats['avg_drop_pct']
+            drop['price_percentile'] = stats['price_percentile']
         final_drops_list.append(drop)
 
-    # 6A. Sonuçları JSON dosyasına yazdır (iOS Uygulaması için)
+    # 7A. Sonuçları JSON dosyasına yazdır (iOS Uygulaması için)
     with open(OUTPUT_JSON_FILE, 'w', encoding='utf-8') as f:
         json.dump(final_drops_list, f, ensure_ascii=False, indent=2)
     print(f"JSON raporu başarıyla '{OUTPUT_JSON_FILE}' dosyasına yazıldı.")
 
-    # 6B. Sonuçları Markdown dosyasına yazdır
+    # 7B. Sonuçları Markdown dosyasına yazdır
     with open(OUTPUT_MD_FILE, 'w', encoding='utf-8') as f:
         report_time = datetime.now().strftime('%d.%m.%Y %H:%M')
         f.write("# PlayStation İndirim Raporu\n\n")
@@ -181,8 +206,13 @@ def generate_report():
         if final_drops_list:
             final_drops_list.sort(key=lambda x: x['name'])
             f.write(f"### Yeni İndirime Giren Toplam {len(final_drops_list)} Ürün Bulundu!\n\n")
-            f.write("| Oyun Adı | Sürüm | Eski Fiyat | Yeni Fiyat | Ne Kadar Süredir İndirimde? |\n")
-            f.write("|---|---|---|---|---|\n")
+            if edition_stats:
+                f.write("| Oyun Adı | Sürüm | Eski Fiyat | Yeni Fiyat | Ne Kadar Süredir İndirimde? "
+                        "| En Düşük Fiyat | İndirim Sayısı | Ort. İndirim | Fiyat Yüzdeliği |\n")
+                f.write("|---|---|---|---|---|---|---|---|---|\n")
+            else:
+                f.write("| Oyun Adı | Sürüm | Eski Fiyat | Yeni Fiyat | Ne Kadar Süredir İndirimde? |\n")
+                f.write("|---|---|---|---|---|\n")
             for game in final_drops_list:
                 days = game['duration_days']
                 duration_text = f"{days} gündür"
@@ -191,8 +221,14 @@ def generate_report():
                 elif days == 1:
                     duration_text = "1 gündür"
 
-                f.write(
-                    f"| {game['name']} | {game['edition']} | ~{game['old_price']}~ | **{game['new_price']}** | {duration_text} |\n")
+                row = f"| {game['name']} | {game['edition']} | ~{game['old_price']}~ | **{game['new_price']}** | {duration_text} |"
+                if edition_stats:
+                    if 'all_time_low' in game:
+                        row += (f" {game['all_time_low']} | {game['drop_count']} | %{game['avg_drop_pct']}"
+                                f" | %{game['price_percentile']} |")
+                    else:
+                        row += " - | - | - | - |"
+                f.write(row + "\n")
         else:
             f.write(f"### Son {LOOKBACK_DAYS} Gün İçinde Yeni Bir İndirim Tespit Edilmedi.\n")
 
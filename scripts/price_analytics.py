@@ -0,0 +1,135 @@
+# scripts/price_analytics.py
+"""
+Fiyat geçmişi üzerinde uzun dönemli analizler.
+
+Yerel önbellek olarak 'export_price_history.py' tarafından üretilen sütunlu
+'price_history.bin' dosyası kullanılır. Dosya günlük iş akışında ayrı bir adımda
+yalnızca yeni kayıtlarla güncellenir; bu modül dosyayı sadece okur. Analiz için
+bloklar mmap üzerinden okunup tek bir NumPy dizi kümesinde birleştirilir (bu adım
+tüm geçmişi belleğe kopyalar) ve tüm hesaplamalar döngü kullanmadan vektörel
+olarak yapılır.
+"""
+
+from typing import Dict, Any, Tuple
+import numpy as np
+
+from export_price_history import PriceHistoryReader, OUTPUT_EXPORT_FILE, MISSING_PRICE
+
+
+# --- ÖNBELLEK ---
+
+def load_columns(reader: PriceHistoryReader) -> Dict[str, np.ndarray]:
+    """
+    Tüm blokları tek bir sütun kümesinde birleştirir. Bloklar mmap üzerinden
+    kopyalanmadan okunur, ancak birleştirme sonucu bellekte yeni dizilerdir.
+    """
+    if not reader.blocks:
+        empty = np.empty(0, dtype=np.int64)
+        return {'game': empty, 'edition': empty, 'timestamp': empty, 'price': empty}
+
+    return {
+        'game': np.concatenate([np.frombuffer(b.game_index, dtype=np.uint32) for b in reader.blocks]),
+        'edition': np.concatenate([np.frombuffer(b.edition_index, dtype=np.uint32) for b in reader.blocks]),
+        'timestamp': np.concatenate([
+            np.frombuffer(b.time_delta, dtype=np.uint32).astype(np.int64) + b.base_timestamp
+            for b in reader.blocks
+        ]),
+        'price': np.concatenate([np.frombuffer(b.price, dtype=np.int32) for b in reader.blocks]),
+    }
+
+
+# --- ANALİZ FONKSİYONLARI ---
+
+def _group_bounds(series_key: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sıralı seri anahtarlarından her serinin başlangıç/bitiş indekslerini ve satır grubunu çıkarır."""
+    starts = np.flatnonzero(np.r_[True, series_key[1:] != series_key[:-1]])
+    ends = np.r_[starts[1:], series_key.size]
+    group = np.repeat(np.arange(starts.size), ends - starts)
+    return starts, ends, group
+
+
+def compute_edition_stats(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Her (oyun, sürüm) serisi için şu istatistikleri hesaplar:
+      - all_time_low   : geçmişteki en düşük fiyat (kuruş)
+      - current_price  : en son fiyat (kuruş)
+      - drop_count     : fiyatın bir önceki kayda göre düştüğü kayıt sayısı
+      - avg_drop_pct   : bu düşüşlerin ortalama derinliği (%)
+      - sale_ratio     : fiyatın serinin en yüksek fiyatının altında olduğu kayıtların oranı
+      - price_percentile: geçmiş kayıtların yüzde kaçının güncel fiyattan düşük ya da eşit olduğu
+    Sonuç, satırları seriler olan sütun dizileridir ('game' ve 'edition' sözlük indeksleridir).
+
+    Fiyatı alınamayan kayıtlar (MISSING_PRICE) hesaba katılmaz. 0 fiyatlı kayıtlar yalnızca
+    serinin tamamı 0 ise (gerçekten ücretsiz oyun) kullanılır; ücretli bir oyunun PS Plus'a
+    dahil olduğu günler indirim ya da en düşük fiyat olarak sayılmaz.
+    """
+    valid = columns['price'] != MISSING_PRICE
+    game = columns['game'][valid].astype(np.int64)
+    edition = columns['edition'][valid].astype(np.int64)
+    timestamp = columns['timestamp'][valid]
+    price = columns['price'][valid].astype(np.int64)
+    if price.size == 0:
+        empty = np.empty(0)
+        return {key: empty for key in ('game', 'edition', 'all_time_low', 'current_price', 'drop_count',
+                                       'avg_drop_pct', 'sale_ratio', 'price_percentile')}
+
+    # Kayıtları seri ve zamana göre sırala
+    series_key = (game << 32) | edition
+    order = np.lexsort((timestamp, series_key))
+    series_key, price = series_key[order], price[order]
+
+    # Ücretli serilerdeki "dahil" (0 fiyatlı) kayıtları çıkar
+    starts, ends, group = _group_bounds(series_key)
+    is_paid_series = np.maximum.reduceat(price, starts) > 0
+    keep = (price > 0) | ~is_paid_series[group]
+    series_key, price = series_key[keep], price[keep]
+
+    starts, ends, group = _group_bounds(series_key)
+    counts = ends - starts
+
+    all_time_low = np.minimum.reduceat(price, starts)
+    highest = np.maximum.reduceat(price, starts)
+    current_price = price[ends - 1]
+
+    # Aynı serideki ardışık kayıtlar arasındaki düşüşler
+    previous, following = price[:-1], price[1:]
+    is_drop = (group[1:] == group[:-1]) & (following < previous) & (previous > 0)
+    drop_group = group[1:][is_drop]
+    drop_depth = (previous[is_drop] - following[is_drop]) / previous[is_drop] * 100
+    drop_count = np.bincount(drop_group, minlength=starts.size)
+    depth_sum = np.bincount(drop_group, weights=drop_depth, minlength=starts.size)
+    avg_drop_pct = np.divide(depth_sum, drop_count, out=np.zeros(starts.size), where=drop_count > 0)
+
+    below_highest = np.bincount(group, weights=price < highest[group], minlength=starts.size)
+    at_or_below_current = np.bincount(group, weights=price <= current_price[group], minlength=starts.size)
+
+    return {
+        'game': series_key[starts] >> 32,
+        'edition': series_key[starts] & 0xFFFFFFFF,
+        'all_time_low': all_time_low,
+        'current_price': current_price,
+        'drop_count': drop_count,
+        'avg_drop_pct': avg_drop_pct,
+        'sale_ratio': below_highest / counts,
+        'price_percentile': at_or_below_current / counts * 100,
+    }
+
+
+def get_edition_stats(path: str = OUTPUT_EXPORT_FILE) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Önbellekteki istatistikleri (gameId, sürüm_adı) anahtarlı bir sözlük olarak döndürür."""
+    with PriceHistoryReader(path) as reader:
+        stats = compute_edition_stats(load_columns(reader))
+        strings = reader.strings
+
+    result = {}
+    for i in range(stats['game'].size):
+        key = (strings[stats['game'][i]], strings[stats['edition'][i]])
+        result[key] = {
+            'all_time_low': float(stats['all_time_low'][i]) / 100,
+            'current_price': float(stats['current_price'][i]) / 100,
+            'drop_count': int(stats['drop_count'][i]),
+            'avg_drop_pct': round(float(stats['avg_drop_pct'][i]), 1),
+            'sale_ratio': round(float(stats['sale_ratio'][i]), 3),
+            'price_percentile': round(float(stats['price_percentile'][i]), 1),
+        }
+    return result
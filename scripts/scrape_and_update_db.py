@@ -2,13 +2,13 @@ from pymongo import MongoClient # YENİ: En üste ekleyin
 from pymongo.database import Database # YENİ: En üste ekleyin
 import requests
 from bs4 import BeautifulSoup
-import csv
 import time
 import os
 import sqlite3
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed  # GÜNCELLEME: Paralel işlem için eklendi
+from typing import List, Dict, Optional, Tuple, Any, Iterator
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED  # GÜNCELLEME: Paralel işlem için eklendi
+from pymongo import UpdateOne
 
 # --- PROJE DİZİNİNİ OTOMATİK BULMA ---
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -27,6 +27,8 @@ HEADERS = {
 MAX_EDITIONS = 5
 # GÜNCELLEME: Aynı anda çalışacak maksimum işçi (thread) sayısı
 MAX_WORKERS = 5
+# Aynı anda kuyrukta bekleyebilecek en fazla görev; iş listesi imleçten akış halinde okunur.
+MAX_PENDING = MAX_WORKERS * 4
 
 
 # --- VERİ İŞLEME VE VERİTABANI YARDIMCI FONKSİYONLARI ---
@@ -59,12 +61,32 @@ def insert_or_update_game(cursor: sqlite3.Cursor, game_data: Dict[str, Any], tab
     cursor.execute(query, values)
 
 
+def load_games_to_scrape(db: Database) -> Iterator[Dict[str, Any]]:
+    """
+    Kazınacak oyunları 'games' koleksiyonundan akış halinde döndürür.
+    Kalıcı olarak kaldırıldığı işaretlenen (delisted) oyunlar atlanır.
+    """
+    cursor = db['games'].find({"delisted": {"$ne": True}}, {'name': 1, 'notFoundCount': 1})
+    for game in cursor:
+        yield {
+            'concept_id': str(game['_id']),
+            'name': game.get('name', 'İsim Yok'),
+            'not_found_count': game.get('notFoundCount', 0),
+        }
+
+
 # --- WEB SCRAPING FONKSİYONLARI ---
 
+class PageNotFound(Exception):
+    """Mağaza sayfası 404 döndürdüğünde fırlatılır."""
+
+
 def get_page_soup(url: str) -> Optional[BeautifulSoup]:
     """Verilen URL'den sayfa içeriğini alır ve BeautifulSoup nesnesi döndürür."""
     try:
         response = requests.get(url, headers=HEADERS, timeout=20)
+        if response.status_code == 404:
+            raise PageNotFound(url)
         response.raise_for_status()
         return BeautifulSoup(response.text, 'html.parser')
     except requests.exceptions.RequestException as e:
@@ -125,10 +147,6 @@ def prepare_document_for_mongodb(concept_id: str, game_name: str, editions: List
 
 def run_scraper_task():
     """Ana fonksiyon, görevleri paralel olarak yürütür ve sonuçları MongoDB'ye yazar."""
-    if not os.path.exists(INPUT_CSV):
-        print(f"HATA: Girdi dosyası bulunamadı: '{INPUT_CSV}'")
-        return
-
     client, db = None, None  # Bağlantıyı en başta None olarak tanımla
     try:
         # YENİ: MongoDB bağlantısını kur.
@@ -138,35 +156,58 @@ def run_scraper_task():
         print(f"Veritabanı bağlantı hatası: {e}")
         return  # Bağlantı kurulamazsa işlemi durdur
 
-    with open(INPUT_CSV, 'r', encoding='utf-8') as f:
-        games_to_scrape = list(csv.DictReader(f))
-
-    total_games = len(games_to_scrape)
+    # İş listesi artık CSV yerine catalog senkronizasyonunun güncel tuttuğu 'games' koleksiyonundan gelir.
+    total_games = db['games'].count_documents({"delisted": {"$ne": True}})
+    if total_games == 0:
+        print("HATA: 'games' koleksiyonunda kazınacak oyun yok. Önce 'sync_catalog.py' çalıştırılmalı.")
+        client.close()
+        return
     print(f"Toplam {total_games} oyun bulundu. {MAX_WORKERS} işçi ile paralel olarak işlenecek...")
 
     processed_count = 0
     inserted_count = 0
-
-    # ThreadPoolExecutor kullanarak görevleri paralel çalıştır
+    status_updates: List[UpdateOne] = []
+
+    def handle_result(future: Future, game: Dict[str, Any]):
+        nonlocal processed_count, inserted_count
+        concept_id = game['concept_id']
+        try:
+            # DEĞİŞTİ: process_game artık doğrudan MongoDB dokümanını döndürecek
+            price_document = future.result()
+            if price_document:
+                # YENİ: Veriyi MongoDB'ye ekle
+                price_collection.insert_one(price_document)
+                inserted_count += 1
+                # Sayfa yeniden erişilebilir olduysa 404 sayacını sıfırla
+                if game['not_found_count'] > 0:
+                    status_updates.append(UpdateOne({"_id": concept_id}, {"$set": {"notFoundCount": 0}}))
+        except PageNotFound:
+            # Art arda 404 alan oyunlar catalog senkronizasyonunda kaldırıldı olarak işaretlenir.
+            status_updates.append(UpdateOne({"_id": concept_id}, {"$inc": {"notFoundCount": 1}}))
+        except Exception as exc:
+            print(f"  -> HATA: '{game['name']}' işlenirken bir istisna oluştu: {exc}")
+        finally:
+            processed_count += 1
+            if processed_count % 10 == 0 or processed_count == total_games:
+                print(f"[{processed_count}/{total_games}] oyun işlendi...")
+
+    # ThreadPoolExecutor kullanarak görevleri paralel çalıştır.
+    # Kuyruk MAX_PENDING ile sınırlı tutulur, böylece tüm liste belleğe alınmaz.
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_game = {executor.submit(process_game, game): game for game in games_to_scrape}
-
-        for future in as_completed(future_to_game):
-            game_name = future_to_game[future].get('name', 'Bilinmeyen Oyun')
-            try:
-                # DEĞİŞTİ: process_game artık doğrudan MongoDB dokümanını döndürecek
-                price_document = future.result()
-                if price_document:
-                    # YENİ: Veriyi MongoDB'ye ekle
-                    price_collection.insert_one(price_document)
-                    inserted_count += 1
-
-            except Exception as exc:
-                print(f"  -> HATA: '{game_name}' işlenirken bir istisna oluştu: {exc}")
-            finally:
-                processed_count += 1
-                if processed_count % 10 == 0 or processed_count == total_games:
-                    print(f"[{processed_count}/{total_games}] oyun işlendi...")
+        pending: Dict[Future, Dict[str, Any]] = {}
+        for game in load_games_to_scrape(db):
+            pending[executor.submit(process_game, game)] = game
+            if len(pending) >= MAX_PENDING:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    handle_result(future, pending.pop(future))
+
+        for future in list(pending):
+            future.exception()  # Görevin bitmesini bekle
+            handle_result(future, pending.pop(future))
+
+    if status_updates:
+        db['games'].bulk_write(status_updates, ordered=False)
 
     # YENİ: Sonuçları ve bağlantıyı kapatma
     if client:
@@ -176,7 +217,7 @@ def run_scraper_task():
     print(f"\nİşlem tamamlandı! {inserted_count} adet fiyat bilgisi 'price_history' koleksiyonuna kaydedildi.")
 
 # GÜNCELLEME: Tek bir oyunu işleyen fonksiyon (paralel çalıştırılacak)
-def process_game(game: Dict[str, str]) -> Optional[Dict[str, Any]]:
+def process_game(game: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Tek bir oyun için tüm scraping ve veri hazırlama adımlarını yürütür."""
     concept_id = game.get('concept_id')
     game_name = game.get('name', 'İsim Yok')
@@ -0,0 +1,181 @@
+# scripts/sync_catalog.py
+"""
+PlayStation Store kategori sayfalarını tarayarak 'games' koleksiyonunu güncel tutar.
+
+- Kategori sayfaları paralel olarak taranır ve bulunan concept ID'leri toplanır.
+- 'games' koleksiyonunda olmayan yeni oyunlar eklenir.
+- Kazıyıcının art arda 404 aldığı oyunlar kaldırıldı (delisted) olarak işaretlenir;
+  böylece her gün bu ID'ler için boşuna istek atılmaz.
+- Kaldırıldı olarak işaretlenen bir oyun tekrar listede görülürse yeniden etkinleştirilir.
+
+Bu betik 'scrape_and_update_db.py' öncesinde çalıştırılmalıdır.
+"""
+
+import os
+import re
+import csv
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from scrape_and_update_db import setup_mongodb_connection, get_page_soup, PageNotFound, INPUT_CSV, MAX_WORKERS
+
+# --- AYARLAR ---
+CATEGORY_URL = "https://store.playstation.com/tr-tr/category/{}/{}"
+# Taranacak kategori ID'leri (virgülle ayrılmış). Varsayılanlar mağazanın
+# "Tüm PS5 oyunları" ve "Tüm PS4 oyunları" listeleridir.
+CATEGORY_IDS = os.getenv(
+    'CATALOG_CATEGORY_IDS',
+    '4cbf39e2-5749-4970-ba81-93a489e4570c,44d8bb20-653e-431e-8ad0-c0a365f68d2f'
+).split(',')
+# Bir kategori için taranacak en fazla sayfa sayısı (sonsuz döngüye karşı güvenlik)
+MAX_PAGES = 500
+# Kaç kez art arda 404 alan oyunun kaldırıldı olarak işaretleneceği
+NOT_FOUND_LIMIT = 3
+# Alınamayan bir kategori sayfasının kaç kez yeniden deneneceği
+PAGE_RETRIES = 3
+
+CONCEPT_HREF_PATTERN = re.compile(r'/concept/(\d+)')
+
+
+# --- WEB SCRAPING FONKSİYONLARI ---
+
+def scrape_category_page(category_id: str, page: int) -> Optional[Dict[str, str]]:
+    """
+    Bir kategori sayfasındaki oyunları {concept_id: isim} olarak döndürür.
+    Boş sözlük listenin sonuna gelindiğini, None ise sayfanın alınamadığını belirtir.
+    """
+    url = CATEGORY_URL.format(category_id, page)
+    soup = None
+    for attempt in range(PAGE_RETRIES):
+        try:
+            soup = get_page_soup(url)
+        except PageNotFound:
+            return {}
+        if soup:
+            break
+        time.sleep(2 ** attempt)
+    if not soup:
+        return None
+
+    concepts = {}
+    for link in soup.find_all('a', href=CONCEPT_HREF_PATTERN):
+        concept_id = CONCEPT_HREF_PATTERN.search(link['href']).group(1)
+        name_tag = link.find('span', attrs={'data-qa': lambda v: v and v.endswith('#product-name')})
+        concepts[concept_id] = name_tag.get_text(strip=True) if name_tag else concepts.get(concept_id, '')
+    return concepts
+
+
+def crawl_catalog() -> Dict[str, str]:
+    """
+    Tüm kategorileri MAX_WORKERS sayfalık dalgalar halinde paralel tarar.
+    Bir kategoride başarıyla alınan boş bir sayfa görüldüğünde o kategorinin sonuna
+    gelinmiş sayılır; alınamayan sayfalar uyarı verilerek atlanır.
+    """
+    catalog: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for category_id in CATEGORY_IDS:
+            page = 1
+            while page <= MAX_PAGES:
+                pages = range(page, min(page + MAX_WORKERS, MAX_PAGES + 1))
+                results = list(executor.map(lambda p: scrape_category_page(category_id, p), pages))
+                for page_number, concepts in zip(pages, results):
+                    if concepts is None:
+                        print(f"UYARI: '{category_id}' kategorisinin {page_number}. sayfası alınamadı, atlanıyor.")
+                        continue
+                    for concept_id, name in concepts.items():
+                        if name or concept_id not in catalog:
+                            catalog[concept_id] = name
+                if any(concepts == {} for concepts in results):
+                    break
+                if all(concepts is None for concepts in results):
+                    # Mağaza art arda hiçbir sayfaya yanıt vermiyorsa bu kategoriyi bırak
+                    print(f"UYARI: '{category_id}' kategorisinin taranması yarıda kesildi.")
+                    break
+                page += MAX_WORKERS
+            print(f"'{category_id}' kategorisi tarandı. Toplam {len(catalog)} oyun bulundu.")
+    return catalog
+
+
+# --- VERİTABANI FONKSİYONLARI ---
+
+def seed_from_csv(db: Database):
+    """'games' koleksiyonu boşsa başlangıç listesini eski CSV dosyasından yükler."""
+    if db['games'].estimated_document_count() > 0 or not os.path.exists(INPUT_CSV):
+        return
+
+    with open(INPUT_CSV, 'r', encoding='utf-8') as f:
+        operations = [
+            UpdateOne({"_id": row['concept_id']}, {"$setOnInsert": {"name": row.get('name', '')}}, upsert=True)
+            for row in csv.DictReader(f) if row.get('concept_id')
+        ]
+    if operations:
+        db['games'].bulk_write(operations, ordered=False)
+        print(f"'games' koleksiyonu CSV dosyasından {len(operations)} oyun ile dolduruldu.")
+
+
+def sync_games(db: Database, catalog: Dict[str, str]) -> int:
+    """Taranan listeyi 'games' koleksiyonu ile karşılaştırır ve yeni oyunları ekler."""
+    now_iso = datetime.now().isoformat() + "Z"
+    known_ids = {str(doc['_id']) for doc in db['games'].find({}, {'_id': 1})}
+
+    operations: List[UpdateOne] = []
+    new_count = 0
+    for concept_id, name in catalog.items():
+        if concept_id not in known_ids:
+            new_count += 1
+            operations.append(UpdateOne(
+                {"_id": concept_id},
+                {"$setOnInsert": {"name": name, "firstSeen": now_iso}, "$set": {"lastSeenInCatalog": now_iso}},
+                upsert=True
+            ))
+        else:
+            # Mağazada tekrar listelenen oyunların kaldırıldı işaretini ve 404 sayacını sıfırla
+            operations.append(UpdateOne(
+                {"_id": concept_id},
+                {"$set": {"lastSeenInCatalog": now_iso, "delisted": False, "notFoundCount": 0}}
+            ))
+
+    if operations:
+        db['games'].bulk_write(operations, ordered=False)
+    return new_count
+
+
+def tombstone_missing_games(db: Database) -> int:
+    """Art arda NOT_FOUND_LIMIT kez 404 alan oyunları kaldırıldı olarak işaretler."""
+    result = db['games'].update_many(
+        {"notFoundCount": {"$gte": NOT_FOUND_LIMIT}, "delisted": {"$ne": True}},
+        {"$set": {"delisted": True, "delistedAt": datetime.now().isoformat() + "Z"}}
+    )
+    return result.modified_count
+
+
+def run_catalog_sync():
+    try:
+        client, db = setup_mongodb_connection()
+    except Exception as e:
+        print(f"Veritabanı bağlantı hatası: {e}")
+        return
+
+    try:
+        seed_from_csv(db)
+
+        catalog = crawl_catalog()
+        # Tarama tamamen başarısız olduysa mevcut listeye dokunma
+        if catalog:
+            new_count = sync_games(db, catalog)
+            print(f"{new_count} yeni oyun 'games' koleksiyonuna eklendi.")
+        else:
+            print("UYARI: Kategori sayfalarından hiç oyun alınamadı, yeni oyun eklenmedi.")
+
+        delisted_count = tombstone_missing_games(db)
+        print(f"{delisted_count} oyun kaldırıldı olarak işaretlendi.")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    run_catalog_sync()
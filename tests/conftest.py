@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+
+class FakeCursor:
+    """pymongo imlecinin aktarıcının kullandığı kısmını taklit eder."""
+
+    def __init__(self, docs, fail_after=None):
+        self.docs = docs
+        self.fail_after = fail_after
+
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        for i, doc in enumerate(self.docs):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionError("imleç yarıda koptu")
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = []
+        self.fail_after = None
+
+    def find(self, query, projection):
+        last_id = query.get('_id', {}).get('$gt')
+        docs = [doc for doc in self.docs if last_id is None or doc['_id'] > last_id]
+        return FakeCursor(docs, self.fail_after)
+
+    def add_history(self, game_id, edition, prices, first_day=1):
+        for day, price in enumerate(prices, start=first_day):
+            self.docs.append({
+                '_id': ObjectId(),
+                'gameId': game_id,
+                'snapshotDate': f"2025-08-{day:02d}T05:00:00Z",
+                'editions': [{'name': edition, 'price': price}],
+            })
+
+
+@pytest.fixture
+def fake_db():
+    return {'price_history': FakeCollection()}
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    return str(tmp_path / 'price_history.bin')
@@ -0,0 +1,96 @@
+import pytest
+
+import export_price_history
+from export_price_history import (
+    PriceHistoryReader, export_price_history as export, FILE_HEADER, FILE_MAGIC, FILE_VERSION, MISSING_PRICE,
+)
+
+
+def read_rows(path):
+    with PriceHistoryReader(path) as reader:
+        return list(reader.iter_rows())
+
+
+def test_prices_are_exported_as_kurus_with_sentinels(fake_db, export_path):
+    fake_db['price_history'].add_history('1', 'Std', ['1.299,00', 'N/A', 'Ücretsiz/Dahil'])
+
+    export(fake_db, export_path)
+
+    with PriceHistoryReader(export_path) as reader:
+        assert list(reader.blocks[0].price) == [129900, MISSING_PRICE, 0]
+    assert [row[3] for row in read_rows(export_path)] == [1299.0, None, 0.0]
+
+
+def test_large_exports_are_split_into_blocks(fake_db, export_path, monkeypatch):
+    monkeypatch.setattr(export_price_history, 'ROWS_PER_BLOCK', 2)
+    fake_db['price_history'].add_history('1', 'Std', ['10,00', '9,00', '8,00', '7,00', '6,00'])
+
+    assert export(fake_db, export_path) == 5
+
+    with PriceHistoryReader(export_path) as reader:
+        assert [len(block.price) for block in reader.blocks] == [2, 2, 1]
+        assert reader.strings == ['1', 'Std']
+    assert [row[3] for row in read_rows(export_path)] == [10.0, 9.0, 8.0, 7.0, 6.0]
+
+
+def test_incremental_run_continues_dictionary(fake_db, export_path):
+    collection = fake_db['price_history']
+    collection.add_history('1', 'Std', ['10,00', '9,00'])
+    assert export(fake_db, export_path) == 2
+
+    collection.add_history('2', 'Deluxe', ['20,00'], first_day=3)
+    collection.add_history('1', 'Std', ['8,00'], first_day=3)
+    assert export(fake_db, export_path) == 2
+
+    with PriceHistoryReader(export_path) as reader:
+        assert reader.strings == ['1', 'Std', '2', 'Deluxe']
+        assert len(reader.blocks) == 2
+    rows = read_rows(export_path)
+    assert [(game, edition, price) for game, _, edition, price in rows] == [
+        ('1', 'Std', 10.0), ('1', 'Std', 9.0), ('2', 'Deluxe', 20.0), ('1', 'Std', 8.0),
+    ]
+
+
+def test_rerun_without_new_documents_appends_nothing(fake_db, export_path):
+    fake_db['price_history'].add_history('1', 'Std', ['10,00'])
+    export(fake_db, export_path)
+    with open(export_path, 'rb') as f:
+        before = f.read()
+
+    assert export(fake_db, export_path) == 0
+    with open(export_path, 'rb') as f:
+        assert f.read() == before
+
+
+def test_failed_run_rolls_back_partial_blocks(fake_db, export_path, monkeypatch):
+    collection = fake_db['price_history']
+    collection.add_history('1', 'Std', ['10,00'])
+    export(fake_db, export_path)
+    with open(export_path, 'rb') as f:
+        before = f.read()
+
+    # Her dokümanda bir blok yazılır; imleç birkaç blok yazıldıktan sonra kopar.
+    monkeypatch.setattr(export_price_history, 'ROWS_PER_BLOCK', 1)
+    collection.add_history('2', 'Yeni', ['1,00', '2,00', '3,00', '4,00'], first_day=2)
+    collection.fail_after = 3
+    with pytest.raises(ConnectionError):
+        export(fake_db, export_path)
+
+    with open(export_path, 'rb') as f:
+        assert f.read() == before
+
+    collection.fail_after = None
+    assert export(fake_db, export_path) == 4
+    assert len(read_rows(export_path)) == 5
+
+
+@pytest.mark.parametrize('header', [
+    FILE_HEADER.pack(b'XXXX', FILE_VERSION, 0),
+    FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION + 1, 0),
+])
+def test_reader_rejects_unknown_files(export_path, header):
+    with open(export_path, 'wb') as f:
+        f.write(header)
+
+    with pytest.raises(ValueError):
+        PriceHistoryReader(export_path)
@@ -0,0 +1,39 @@
+from price_analytics import get_edition_stats
+from export_price_history import export_price_history
+
+
+def edition_stats(fake_db, export_path, game_id, edition, prices):
+    fake_db['price_history'].add_history(game_id, edition, prices)
+    export_price_history(fake_db, export_path)
+    return get_edition_stats(export_path)[(game_id, edition)]
+
+
+def test_missing_price_in_middle_of_series_is_ignored(fake_db, export_path):
+    stats = edition_stats(fake_db, export_path, '10011898', 'Standart Sürüm',
+                          ['1.000,00', '800,00', 'N/A', '800,00', '600,00'])
+
+    # N/A kaydı 0 TL'lik bir fiyat ya da %100'lük bir düşüş olarak sayılmamalı
+    assert stats['all_time_low'] == 600.0
+    assert stats['current_price'] == 600.0
+    assert stats['drop_count'] == 2
+    assert stats['avg_drop_pct'] == 22.5
+    assert stats['price_percentile'] == 25.0
+
+
+def test_free_titles_keep_zero_price(fake_db, export_path):
+    stats = edition_stats(fake_db, export_path, '10009762', 'Oyun', ['Ücretsiz/Dahil', 'Ücretsiz/Dahil'])
+
+    assert stats['all_time_low'] == 0.0
+    assert stats['drop_count'] == 0
+
+
+def test_included_snapshots_of_paid_titles_are_ignored(fake_db, export_path):
+    stats = edition_stats(fake_db, export_path, '10001234', 'Standart Sürüm',
+                          ['1.299,00', 'Ücretsiz/Dahil', '1.299,00', '999,00', 'Ücretsiz/Dahil'])
+
+    # PS Plus'a dahil olduğu günler en düşük fiyatı 0'a çekmemeli ve %100 düşüş sayılmamalı
+    assert stats['all_time_low'] == 999.0
+    assert stats['current_price'] == 999.0
+    assert stats['drop_count'] == 1
+    assert stats['avg_drop_pct'] == 23.1
+    assert stats['price_percentile'] == 33.3